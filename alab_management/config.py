@@ -25,17 +25,27 @@ An example of the yaml file is as follows:
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from types import MappingProxyType as FrozenDict
 from typing import Any, Dict
 
-import toml
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import toml as tomllib
+
+
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
 
 
 def freeze_config(config_: Dict[str, Any]) -> FrozenDict:
     """
     Convert the config dict to frozen config.
 
+    Lists are converted to tuples and dicts to frozen dicts. The tree is walked iteratively
+    with an explicit stack, so that deeply nested configs do not recurse.
+
     Args:
         config_: the dict of config data
 
@@ -44,23 +54,52 @@ def freeze_config(config_: Dict[str, Any]) -> FrozenDict:
         frozen_config, which can not be modified
     """
 
-    def _frozen_collection(collection_or_element):
-        """Convert a list to tuple, a dict to frozen_dict recursively."""
-        if isinstance(collection_or_element, list):
-            return tuple(_frozen_collection(element) for element in collection_or_element)
-        if isinstance(collection_or_element, dict):
-            return FrozenDict({k: _frozen_collection(v) for k, v in collection_or_element.items()})
-
-        return collection_or_element
+    def _children(collection):
+        return iter(collection.values() if isinstance(collection, dict) else collection)
+
+    def _freeze(collection, frozen_children):
+        if isinstance(collection, dict):
+            return FrozenDict(dict(zip(collection, frozen_children)))
+        return tuple(frozen_children)
+
+    if not isinstance(config_, (dict, list)):
+        return config_
+
+    # each frame holds a collection, an iterator over its children and the children frozen so far
+    stack = [(config_, _children(config_), [])]
+    while True:
+        collection, children, frozen_children = stack[-1]
+        for child in children:
+            # exact type check first, so that leaves are handled without further dispatch
+            if type(child) in _SCALAR_TYPES or not isinstance(child, (dict, list)):
+                frozen_children.append(child)
+            else:
+                stack.append((child, _children(child), []))
+                break
+        else:
+            stack.pop()
+            frozen = _freeze(collection, frozen_children)
+            if not stack:
+                return frozen
+            stack[-1][2].append(frozen)
+
+
+@lru_cache(maxsize=None)
+def _load_frozen_config(config_path: Path, mtime: float) -> FrozenDict:
+    """
+    Parse and freeze a toml config file.
 
-    return _frozen_collection(config_)
+    The result is memoized on the path and the modification time of the file, so that the config file
+    is only parsed once per process unless it is changed on disk.
+    """
+    return freeze_config(tomllib.loads(config_path.read_text(encoding="utf-8")))
 
 
 class AlabConfig:
-    """Class used for storing all the config data."""
+    """Class used for storing all the config data. The config file is loaded on first access."""
 
     def __init__(self):
-        """Load a immutable toml config file from `config_path`."""
+        """Locate the toml config file, which will be loaded as an immutable mapping on first access."""
         config_path = os.getenv("ALAB_CONFIG", None)
         sim_mode_flag = os.getenv("SIM_MODE_FLAG", "True")
         sim_mode_flag_boolean = sim_mode_flag.lower() == "true"
@@ -70,26 +109,43 @@ class AlabConfig:
         if config_path is None:
             config_path = "config.toml"
 
+        self._path = Path(config_path).absolute()
+        self._loaded = False
+        self._config: FrozenDict = FrozenDict({})
+
+    def load(self):
+        """
+        Load the config file if it has not been loaded yet.
+
+        The config is loaded automatically on first access, this method can be called to load
+        (and validate) it eagerly.
+
+        Raises
+        ------
+            FileNotFoundError: if the config file does not exist
+        """
+        if self._loaded:
+            return
+
         try:
-            with open(config_path, encoding="utf-8") as f:
-                _config = toml.load(f)
+            self._config = _load_frozen_config(self._path, self._path.stat().st_mtime)
         except FileNotFoundError as exc:
             raise FileNotFoundError(
-                f"Config file was not found at {config_path}."
+                f"Config file was not found at {self._path}."
                 "Please set your computer's environment variable 'ALAB_CONFIG' to the path to the config file. In "
                 "absence of this environment variable, we assume there is a file named config.toml in the current "
                 "directory."
             ) from exc
-
-        self._path = Path(config_path).absolute()
-        self._config = freeze_config(_config)
+        self._loaded = True
 
     def __getitem__(self, item):
         """Get the config item."""
+        self.load()
         return self._config.__getitem__(item)
 
     def __str__(self):
         """Get the string representation of the config."""
+        self.load()
         return self._config.__repr__()
 
     def __repr__(self):
@@ -98,18 +154,22 @@ class AlabConfig:
 
     def __hash__(self):  # type: ignore
         """Get the hash of the config."""
+        self.load()
         return self._config.__hash__()
 
     def get(self, item, default=None):
         """Get the config item."""
+        self.load()
         return self._config.get(item, default)
 
     def set_item(self, key, value):
         """Set a specific config item."""
+        self.load()
         self._config[key] = value
 
     def __contains__(self, item):
         """Check if the config contains the item."""
+        self.load()
         return self._config.__contains__(item)
 
     @property
@@ -6,19 +6,18 @@ It can also update the position of a sample in the lab.
 """
 
 from contextlib import contextmanager
+from functools import cached_property
 from traceback import format_exc
 from typing import Any, Dict, List, Optional, Type, Union
 
 from bson import ObjectId
-from pydantic import root_validator
-from pydantic.main import BaseModel
 
 from alab_management.device_manager import DevicesClient
 from alab_management.device_view.device import BaseDevice
 from alab_management.experiment_view.experiment_view import ExperimentView
 from alab_management.logger import DBLogger
 from alab_management.sample_view.sample import Sample
-from alab_management.sample_view.sample_view import SamplePositionRequest, SampleView
+from alab_management.sample_view.sample_view import SampleView
 from alab_management.task_manager.resource_requester import ResourceRequester
 from alab_management.task_view.task import BaseTask
 from alab_management.task_view.task_enums import TaskPriority, TaskStatus
@@ -30,33 +29,6 @@ class DeviceRunningException(Exception):
     """Raise when a task try to release a device that is still running."""
 
 
-class ResourcesRequest(BaseModel):
-    """
-    This class is used to validate the resource request. Each request should have a format of
-    [DeviceType: List of SamplePositionRequest].
-
-    See Also
-    --------
-        :py:class:`SamplePositionRequest <alab_management.sample_view.sample_view.SamplePositionRequest>`
-    """
-
-    __root__: Dict[Optional[Type[BaseDevice]], List[SamplePositionRequest]]  # type: ignore
-
-    @root_validator(pre=True, allow_reuse=True)
-    def preprocess(cls, values):
-        """Preprocess the request to make sure the request is in the correct format."""
-        values = values["__root__"]
-        # if the sample position request is string, we will automatically add a number attribute = 1.
-        values = {
-            k: [
-                SamplePositionRequest.from_str(v_) if isinstance(v_, str) else v_
-                for v_ in v
-            ]
-            for k, v in values.items()
-        }
-        return {"__root__": values}
-
-
 class LabView:
     """
     LabView is a wrapper over device view and sample view.
@@ -66,18 +38,36 @@ class LabView:
 
     def __init__(self, task_id: ObjectId):
         self._task_view = TaskView()
-        self.__task_entry = self._task_view.get_task(
+        self._task_entry = self._task_view.get_task(
             task_id=task_id
         )  # will throw error if task_id does not exist
-        self._experiment_view = ExperimentView()
         self._task_id = task_id
-        self._sample_view = SampleView()
-        self._resource_requester = ResourceRequester(task_id=task_id)
-        self._device_client = DevicesClient(task_id=task_id, timeout=None)
-        self.logger = DBLogger(task_id=task_id)
 
         self._priority = TaskPriority.NORMAL.value
 
+    # the collaborators below are only built on first use, as many tasks only need a few of them
+
+    @cached_property
+    def _experiment_view(self) -> ExperimentView:
+        return ExperimentView()
+
+    @cached_property
+    def _sample_view(self) -> SampleView:
+        return SampleView()
+
+    @cached_property
+    def _resource_requester(self) -> ResourceRequester:
+        return ResourceRequester(task_id=self._task_id)
+
+    @cached_property
+    def _device_client(self) -> DevicesClient:
+        return DevicesClient(task_id=self._task_id, timeout=None)
+
+    @cached_property
+    def logger(self) -> DBLogger:
+        """The logger of the current task."""
+        return DBLogger(task_id=self._task_id)
+
     @property
     def task_id(self) -> ObjectId:
         """Get the task id of the current task."""
@@ -138,11 +128,11 @@ class LabView:
 
         Looks up sample name->id mapping for the experiment `self.task_id` belongs to.
         """
-        for sample in self.__task_entry["samples"]:
+        for sample in self._task_entry["samples"]:
             if sample["name"] == sample_name:
                 return sample["sample_id"]
         raise ValueError(
-            f"No sample with name \"{sample_name}\" found for task \"{self.__task_entry['type']}\""
+            f"No sample with name \"{sample_name}\" found for task \"{self._task_entry['type']}\""
         )
 
     def get_sample(self, sample: Union[ObjectId, str]) -> Sample:
@@ -330,7 +320,7 @@ class LabView:
             self.task_id
         )
 
-        all_samples = self.__task_entry["samples"]
+        all_samples = self._task_entry["samples"]
         all_positions_with_samples = [
             self._sample_view.get_sample(sample_entry["sample_id"]).position
             for sample_entry in all_samples
@@ -1,20 +1,43 @@
 """A wrapper over the ``samples`` and ``sample_positions`` collections."""
 
 import re
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum, auto
+from functools import lru_cache
+from heapq import nsmallest
+from numbers import Integral
 from typing import Any, Dict, List, Optional, Tuple, Union, cast
 
 import pymongo  # type: ignore
 from bson import ObjectId  # type: ignore
-from pydantic import BaseModel, conint
+from pymongo import UpdateOne  # type: ignore
+from pymongo.collection import Collection  # type: ignore
 
 from alab_management.utils.data_objects import get_collection, get_lock
+from alab_management.utils.db_lock import MongoLock
 
 from .sample import Sample, SamplePosition
 
+_BAD_NAME_RE = re.compile(r"[.$]")
 
-class SamplePositionRequest(BaseModel):
+# fields of a sample position that do not change after ``add_sample_positions_to_db``
+_STATIC_POSITION_FIELDS = ("name", "description", "parent_device")
+_POSITION_CACHE_TTL = 30  # seconds
+
+# constant update document for releasing sample positions, shared by all calls (pymongo does not modify it)
+_RELEASE_POSITION_UPDATE = {"$set": {"task_id": None}}
+
+
+@lru_cache(maxsize=512)
+def _prefix_filter(prefix: str) -> Dict[str, str]:
+    """Build (and cache) the anchored regex filter that matches names starting with ``prefix``."""
+    return {"$regex": f"^{re.escape(prefix)}"}
+
+
+@dataclass(frozen=True)
+class SamplePositionRequest:
     """
     The class is used to request sample position.
 
@@ -22,13 +45,19 @@ class SamplePositionRequest(BaseModel):
     the number you request. By default, the number is set to be 1.
     """
 
-    class Config:
-        """raise error when extra kwargs."""
-
-        extra = "forbid"
-
     prefix: str
-    number: conint(ge=0) = 1  # type: ignore
+    number: int = 1
+
+    def __post_init__(self):
+        """Check the request format."""
+        if not isinstance(self.prefix, str):
+            raise ValueError(f"The prefix of a sample position request should be a str, but got {self.prefix!r}")
+        if isinstance(self.number, bool) or not isinstance(self.number, Integral) or self.number < 0:
+            raise ValueError(
+                f"The number of a sample position request should be a non-negative int, but got {self.number!r}"
+            )
+        # store a plain int (e.g. not np.int64), so that the request can be saved in the database
+        object.__setattr__(self, "number", int(self.number))
 
     @classmethod
     def from_str(cls, sample_position_prefix: str) -> "SamplePositionRequest":
@@ -43,6 +72,31 @@ class SamplePositionRequest(BaseModel):
         return cls(**sample_position)
 
 
+@lru_cache(maxsize=None)
+def _get_collections() -> Tuple[Collection, Collection, MongoLock]:
+    """
+    Get the ``samples`` and ``sample_positions`` collections and the lock of sample positions.
+
+    The indexes are only created the first time this is called in a process. Call ``_get_collections.cache_clear()``
+    after dropping a collection so that its indexes are created again.
+    """
+    sample_collection = get_collection("samples")
+    sample_positions_collection = get_collection("sample_positions")
+    sample_positions_collection.create_index(
+        [
+            (
+                "name",
+                pymongo.HASHED,
+            )
+        ]
+    )
+    # hashed index cannot serve prefix queries, the anchored regex ``^prefix`` (with escaped
+    # metacharacters, see ``_prefix_filter``) can use this B-tree index instead
+    sample_positions_collection.create_index([("name", pymongo.ASCENDING), ("task_id", pymongo.ASCENDING)])
+    sample_collection.create_index([("position", pymongo.ASCENDING)], sparse=True)
+    return sample_collection, sample_positions_collection, get_lock(sample_positions_collection.name)
+
+
 class SamplePositionStatus(Enum):
     """
     The status of a sample position.
@@ -61,17 +115,9 @@ class SampleView:
     """Sample view manages the samples and their positions."""
 
     def __init__(self):
-        self._sample_collection = get_collection("samples")
-        self._sample_positions_collection = get_collection("sample_positions")
-        self._sample_positions_collection.create_index(
-            [
-                (
-                    "name",
-                    pymongo.HASHED,
-                )
-            ]
-        )
-        self._lock = get_lock(self._sample_positions_collection.name)
+        self._sample_collection, self._sample_positions_collection, self._lock = _get_collections()
+        # name -> (expire time, static fields of the sample position)
+        self._position_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
 
     def add_sample_positions_to_db(
         self,
@@ -88,6 +134,8 @@ class SampleView:
             sample_positions: some sample position instances
             parent_device_name: name of the parent device to these sample_positions.
         """
+        now = datetime.now()
+        operations = []
         for sample_pos in sample_positions:
             for i in range(sample_pos.number):
                 # we use <name><SEPARATOR><number> format to create multiple sample positions
@@ -101,26 +149,30 @@ class SampleView:
                 if parent_device_name:
                     name = f"{parent_device_name}{SamplePosition.SEPARATOR}{name}"
 
-                if re.search(r"[$.]", name) is not None:
+                if _BAD_NAME_RE.search(name) is not None:
                     raise ValueError(
                         f"Unsupported sample position name: {name}. " f"Sample position name should not contain '.' or '$'"
                     )
 
-                sample_pos_ = self._sample_positions_collection.find_one({"name": name})
-                if sample_pos_ is None:
-                    new_entry = {
-                        "name": name,
-                        "description": sample_pos.description,
-                        "task_id": None,
-                        "last_updated": datetime.now(),
-                    }
-                    if parent_device_name:
-                        new_entry["parent_device"] = parent_device_name
-                    self._sample_positions_collection.insert_one(new_entry)
+                new_entry = {
+                    "description": sample_pos.description,
+                    "task_id": None,
+                    "last_updated": now,
+                }
+                if parent_device_name:
+                    new_entry["parent_device"] = parent_device_name
+                # only insert the entry if there is no sample position with the same name,
+                # the name is filled in from the filter on upsert
+                operations.append(UpdateOne({"name": name}, {"$setOnInsert": new_entry}, upsert=True))
+
+        if operations:
+            self._sample_positions_collection.bulk_write(operations, ordered=False)
 
     def clean_up_sample_position_collection(self):
         """Drop the sample position collection."""
         self._sample_positions_collection.drop()
+        self._position_cache.clear()
+        _get_collections.cache_clear()
 
     def request_sample_positions(
         self,
@@ -146,28 +198,104 @@ class SampleView:
         if len(sample_positions_request) != len({sample_position.prefix for sample_position in sample_positions_request}):
             raise ValueError("Duplicated sample_positions in one request.")
 
+        with self._lock():  # pylint: disable=not-callable
+            matched_positions = self.bulk_request_sample_positions(
+                prefixes=[sample_position.prefix for sample_position in sample_positions_request]
+            )
+
         # check if there are enough positions
         for sample_position in sample_positions_request:
-            count = self._sample_positions_collection.count_documents(
-                {"name": {"$regex": f"^{re.escape(sample_position.prefix)}"}}
-            )
+            count = len(matched_positions[sample_position.prefix])
+            if count == 0:
+                raise ValueError(f"Cannot find device with prefix: {sample_position.prefix}")
             if count < sample_position.number:
                 raise ValueError(
                     f"Position prefix `{sample_position.prefix}` can only "
                     f"have {count} matches, but requests {sample_position.number}"
                 )
 
-        with self._lock():  # pylint: disable=not-callable
-            available_positions: Dict[str, List[Dict[str, Union[str, bool]]]] = {}
-            for sample_position in sample_positions_request:
-                result = self.get_available_sample_position(task_id, position_prefix=sample_position.prefix)
-                if not result or len(result) < sample_position.number:
-                    return None
-                # we try to choose the position that has already been locked by this task
-                available_positions[sample_position.prefix] = sorted(result, key=lambda task: int(task["need_release"]))[
-                    : sample_position.number
+        available_positions: Dict[str, List[Dict[str, Union[str, bool]]]] = {}
+        for sample_position in sample_positions_request:
+            result = self._filter_available_sample_positions(task_id, matched_positions[sample_position.prefix])
+            if not result or len(result) < sample_position.number:
+                return None
+            # we try to choose the position that has already been locked by this task
+            available_positions[sample_position.prefix] = nsmallest(
+                sample_position.number, result, key=lambda task: task["need_release"]
+            )
+        return available_positions
+
+    def bulk_request_sample_positions(self, prefixes: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch all the sample positions matching any of the prefixes, together with their occupying samples.
+
+        This is done in a single aggregation: the positions are matched by prefix, joined with the ``samples``
+        collection on ``position``, and split into one bucket per prefix (a position can appear in several
+        buckets if the prefixes overlap).
+
+        Args:
+            prefixes: the prefixes of the sample positions
+
+        Returns
+        -------
+            a dict of ``{prefix: [{"name": str, "task_id": ObjectId | None, "_occupants": [{"task_id": ...}]}]}``
+        """
+        if not prefixes:
+            return {}
+
+        result = next(
+            self._sample_positions_collection.aggregate(
+                [
+                    {"$match": {"$or": [{"name": _prefix_filter(prefix)} for prefix in prefixes]}},
+                    *self._join_occupants_stages(),
+                    # facet names cannot contain "." or start with "$", so we use the index of the prefix instead
+                    {
+                        "$facet": {
+                            str(i): [{"$match": {"name": _prefix_filter(prefix)}}] for i, prefix in enumerate(prefixes)
+                        }
+                    },
                 ]
-            return available_positions
+            )
+        )
+        return {prefix: result[str(i)] for i, prefix in enumerate(prefixes)}
+
+    def _join_occupants_stages(self) -> List[Dict[str, Any]]:
+        """Aggregation stages that attach the samples sitting in each position as ``_occupants``."""
+        return [
+            {
+                "$lookup": {
+                    "from": self._sample_collection.name,
+                    "localField": "name",
+                    "foreignField": "position",
+                    "as": "_occupants",
+                }
+            },
+            {"$project": {"_id": 0, "name": 1, "task_id": 1, "_occupants.task_id": 1}},
+        ]
+
+    @staticmethod
+    def _filter_available_sample_positions(
+        task_id: ObjectId, sample_positions: List[Dict[str, Any]]
+    ) -> List[Dict[str, Union[str, bool]]]:
+        """
+        Select the sample positions that can be used by the task from the joined position entries.
+
+        A position is available if it is EMPTY, or if it is occupied/locked by the task itself. See
+        :py:meth:`get_sample_position_status` for the definition of the status.
+        """
+        available_sp_names = []
+        for sample_position in sample_positions:
+            if sample_position["task_id"] not in (None, task_id):
+                continue  # locked by another task
+            if sample_position["_occupants"] and sample_position["_occupants"][0]["task_id"] != task_id:
+                continue  # occupied by a sample that does not belong to this task
+            available_sp_names.append(
+                {
+                    "name": sample_position["name"],
+                    "need_release": sample_position["task_id"] != task_id,
+                }
+            )
+        return available_sp_names
 
     def get_sample_position(self, position: str) -> Optional[Dict[str, Any]]:
         """
@@ -175,7 +303,38 @@ class SampleView:
 
         if the position is not a valid position (not defined in the database), return None
         """
-        return self._sample_positions_collection.find_one({"name": position})
+        sample_position = self._sample_positions_collection.find_one({"name": position})
+        if sample_position is not None:
+            self._cache_sample_position(sample_position)
+        return sample_position
+
+    def _cache_sample_position(self, sample_position: Dict[str, Any]):
+        """Store the static fields of a sample position entry in the process-local cache."""
+        self._position_cache[sample_position["name"]] = (
+            time.monotonic() + _POSITION_CACHE_TTL,
+            {field: sample_position.get(field) for field in _STATIC_POSITION_FIELDS},
+        )
+
+    def _get_static_sample_position(self, position: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the static fields (name, description and parent device) of a sample position.
+
+        These fields do not change once the sample position is added to the database, so they are served from
+        a short-lived cache when possible. The ``task_id`` of the position is not included, use
+        :py:meth:`get_sample_position` for that. Return None if the position is not defined in the database.
+        """
+        cached = self._position_cache.get(position)
+        if cached is not None and cached[0] > time.monotonic():
+            return dict(cached[1])
+
+        sample_position = self._sample_positions_collection.find_one(
+            {"name": position}, {field: 1 for field in _STATIC_POSITION_FIELDS}
+        )
+        if sample_position is None:
+            self._position_cache.pop(position, None)
+            return None
+        self._cache_sample_position(sample_position)
+        return dict(self._position_cache[position][1])
 
     def get_sample_position_status(self, position: str) -> Tuple[SamplePositionStatus, Optional[ObjectId]]:
         """
@@ -194,11 +353,11 @@ class SampleView:
             if the position is locked by a task, return LOCKED and the task id
             else, return EMPTY and None
         """
-        sample_position = self.get_sample_position(position=position)
+        sample_position = self._sample_positions_collection.find_one({"name": position}, {"task_id": 1, "_id": 0})
         if sample_position is None:
             raise ValueError(f"Invalid sample position: {position}")
 
-        sample = self._sample_collection.find_one({"position": position})
+        sample = self._sample_collection.find_one({"position": position}, {"task_id": 1})
         if sample is not None:
             return SamplePositionStatus.OCCUPIED, sample["task_id"]
 
@@ -216,7 +375,15 @@ class SampleView:
         for position="furnace_1/tray" will properly return "furnace_1" even if "furnace_1/tray/1" and
         "furnace_1/tray/2" are in the database _as long as "furnace_1" is the parent device of both!_).
         """
-        sample_positions = self._sample_positions_collection.find({"name": {"$regex": f"^{position}"}})
+        # exact match first, which is served from the position cache or the index on name
+        sample_position = self._get_static_sample_position(position)
+        if sample_position is not None:
+            return sample_position["parent_device"]
+
+        # project the parent device only. ``distinct`` is not used as it skips the positions without a parent device
+        sample_positions = self._sample_positions_collection.find(
+            {"name": _prefix_filter(position)}, {"parent_device": 1, "_id": 0}
+        )
         parent_devices = list({sp.get("parent_device") for sp in sample_positions})
         if len(parent_devices) == 0:
             raise ValueError(f"No sample position(s) beginning with: {position}")
@@ -239,70 +406,112 @@ class SampleView:
         The entry need_release indicates whether a sample position needs to be released
         when __exit__ method is called in the ``SamplePositionsLock``.
         """
-        if self._sample_positions_collection.find_one({"name": {"$regex": f"^{re.escape(position_prefix)}"}}) is None:
+        if self._sample_positions_collection.find_one({"name": _prefix_filter(position_prefix)}) is None:
             raise ValueError(f"Cannot find device with prefix: {position_prefix}")
 
-        available_sample_positions = self._sample_positions_collection.find(
-            {
-                "name": {"$regex": f"^{re.escape(position_prefix)}"},
-                "$or": [
-                    {
-                        "task_id": None,
-                    },
-                    {
-                        "task_id": task_id,
-                    },
-                ],
-            }
-        )
-        available_sp_names = []
-        for sample_position in available_sample_positions:
-            status, current_task_id = self.get_sample_position_status(sample_position["name"])
-            if status is SamplePositionStatus.EMPTY or task_id == current_task_id:
-                available_sp_names.append(
-                    {
-                        "name": sample_position["name"],
-                        "need_release": self.get_sample_position(sample_position["name"])["task_id"] != task_id,  # type: ignore
+        available_sample_positions = self._sample_positions_collection.aggregate(
+            [
+                {
+                    "$match": {
+                        "name": _prefix_filter(position_prefix),
+                        "$or": [
+                            {
+                                "task_id": None,
+                            },
+                            {
+                                "task_id": task_id,
+                            },
+                        ],
                     }
-                )
-        return available_sp_names
+                },
+                *self._join_occupants_stages(),
+            ]
+        )
+        return self._filter_available_sample_positions(task_id, list(available_sample_positions))
 
     def lock_sample_position(self, task_id: ObjectId, position: str):
         """Lock a sample position."""
-        sample_status, current_task_id = self.get_sample_position_status(position)
+        self.lock_sample_positions(task_id=task_id, positions=[position])
 
-        if current_task_id != task_id:
-            if sample_status is SamplePositionStatus.OCCUPIED:
-                raise ValueError(f"Position ({position}) is currently occupied")
-            if sample_status is SamplePositionStatus.LOCKED:
+    def lock_sample_positions(self, task_id: ObjectId, positions: List[str]):
+        """
+        Lock a list of sample positions.
+
+        A position can be locked if it is not occupied by a sample of another task, and it is not locked
+        by another task. All the positions are checked before any of them is locked, so a failed call does
+        not leave any lock behind. The positions are locked with a single ``update_many``.
+        """
+        positions = list(set(positions))
+        if not positions:
+            return
+
+        current_task_ids = self._get_sample_position_task_ids(positions)
+
+        occupied_position = self._sample_collection.find_one(
+            {"position": {"$in": positions}, "task_id": {"$ne": task_id}}, {"position": 1}
+        )
+        if occupied_position is not None:
+            raise ValueError(f"Position ({occupied_position['position']}) is currently occupied")
+
+        for current_task_id in current_task_ids.values():
+            if current_task_id not in (None, task_id):
                 raise ValueError(f"Position is currently locked by task: {current_task_id}")
 
-        self._sample_positions_collection.update_one(
-            {"name": position},
+        result = self._sample_positions_collection.update_many(
+            {"name": {"$in": positions}, "task_id": {"$in": [None, task_id]}},
             {
                 "$set": {
                     "task_id": task_id,
                 }
             },
         )
+        if result.matched_count != len(positions):
+            # another task locked some of the positions in the meantime,
+            # undo the locks this call has taken on the positions that were free
+            free_positions = [
+                position for position, current_task_id in current_task_ids.items() if current_task_id is None
+            ]
+            self._sample_positions_collection.update_many(
+                {"name": {"$in": free_positions}, "task_id": task_id}, _RELEASE_POSITION_UPDATE
+            )
+            raise ValueError(f"Positions ({', '.join(positions)}) are locked by another task in the meantime")
 
     def release_sample_position(self, position: str):
         """Unlock a sample position."""
-        if self.get_sample_position(position) is None:
-            raise ValueError(f"Invalid sample position: {position}")
+        self.release_sample_positions(positions=[position])
 
-        self._sample_positions_collection.update_one(
-            {"name": position},
-            {
-                "$set": {
-                    "task_id": None,
-                }
-            },
-        )
+    def release_sample_positions(self, positions: List[str]):
+        """
+        Unlock a list of sample positions with a single ``update_many``.
+
+        All the positions are checked to be valid before any of them is released.
+        """
+        positions = list(set(positions))
+        if not positions:
+            return
+
+        self._get_sample_position_task_ids(positions)
+        self._sample_positions_collection.update_many({"name": {"$in": positions}}, _RELEASE_POSITION_UPDATE)
+
+    def _get_sample_position_task_ids(self, positions: List[str]) -> Dict[str, Optional[ObjectId]]:
+        """Get the task id locking each of the positions, raise ``ValueError`` if any position is not defined."""
+        current_task_ids = {
+            sample_position["name"]: sample_position["task_id"]
+            for sample_position in self._sample_positions_collection.find(
+                {"name": {"$in": positions}}, {"name": 1, "task_id": 1, "_id": 0}
+            )
+        }
+        invalid_positions = [position for position in positions if position not in current_task_ids]
+        if invalid_positions:
+            raise ValueError(f"Invalid sample position: {', '.join(invalid_positions)}")
+        return current_task_ids
 
     def get_sample_positions_by_task(self, task_id: Optional[ObjectId]) -> List[str]:
         """Get the list of sample positions that is locked by a task (given task id)."""
-        return [sample_position["name"] for sample_position in self._sample_positions_collection.find({"task_id": task_id})]
+        return [
+            sample_position["name"]
+            for sample_position in self._sample_positions_collection.find({"task_id": task_id}, {"name": 1, "_id": 0})
+        ]
 
     #################################################################
     #                 operations related to samples                 #
@@ -324,17 +533,18 @@ class SampleView:
         if position is not None and not self.is_unoccupied_position(position):
             raise ValueError(f"Requested position ({position}) is not EMPTY.")
 
-        if re.search(r"[.$]", name) is not None:
+        if _BAD_NAME_RE.search(name) is not None:
             raise ValueError(f"Unsupported sample name: {name}. " f"Sample name should not contain '.' or '$'")
 
+        now = datetime.now()
         entry = {
             "name": name,
             "tags": tags or [],
             "metadata": metadata or {},
             "position": position,
             "task_id": None,
-            "created_at": datetime.now(),
-            "last_updated": datetime.now(),
+            "created_at": now,
+            "last_updated": now,
         }
         if sample_id:
             if not isinstance(sample_id, ObjectId):
@@ -377,11 +587,7 @@ class SampleView:
 
     def update_sample_task_id(self, sample_id: ObjectId, task_id: Optional[ObjectId]):
         """Update the task id for a sample."""
-        result = self._sample_collection.find_one({"_id": sample_id})
-        if result is None:
-            raise ValueError(f"Cannot find sample with id: {sample_id}")
-
-        self._sample_collection.update_one(
+        result = self._sample_collection.update_one(
             {"_id": sample_id},
             {
                 "$set": {
@@ -390,21 +596,20 @@ class SampleView:
                 }
             },
         )
+        if result.matched_count == 0:
+            raise ValueError(f"Cannot find sample with id: {sample_id}")
 
     def move_sample(self, sample_id: ObjectId, position: Optional[str]):
         """Update the sample with new position."""
-        result = self._sample_collection.find_one({"_id": sample_id})
-        if result is None:
-            raise ValueError(f"Cannot find sample with id: {sample_id}")
-
-        if result["position"] == position:
-            return
-
-        if position is not None and not self.is_unoccupied_position(position):
-            raise ValueError(f"Requested position ({position}) is not EMPTY or LOCKED by other task.")
-
-        self._sample_collection.update_one(
-            {"_id": sample_id},
+        if position is not None:
+            if self._get_static_sample_position(position) is None:
+                raise ValueError(f"Invalid sample position: {position}")
+            # the position may only be occupied by the sample itself
+            if self._sample_collection.find_one({"position": position, "_id": {"$ne": sample_id}}, {"_id": 1}):
+                raise ValueError(f"Requested position ({position}) is not EMPTY or LOCKED by other task.")
+
+        result = self._sample_collection.update_one(
+            {"_id": sample_id, "position": {"$ne": position}},
             {
                 "$set": {
                     "position": position,
@@ -412,6 +617,9 @@ class SampleView:
                 }
             },
         )
+        # nothing is matched either if the sample does not exist, or if it is already in the position
+        if result.matched_count == 0 and not self.exists(sample_id):
+            raise ValueError(f"Cannot find sample with id: {sample_id}")
 
     def exists(self, sample_id: Union[ObjectId, str]) -> bool:
         """Check if a sample exists in the database.
@@ -423,4 +631,6 @@ class SampleView:
         -------
             bool: True if sample exists in the database
         """
-        return self._sample_collection.count_documents({"_id": ObjectId(sample_id)}) > 0
+        if not isinstance(sample_id, ObjectId):
+            sample_id = ObjectId(sample_id)
+        return self._sample_collection.find_one({"_id": sample_id}, {"_id": 1}) is not None
@@ -7,4 +7,4 @@ def config_file_update(sim_mode: bool = False):
     if sim_mode:
         os.environ["SIM_MODE_FLAG"] = "True"
 
-    AlabConfig()
+    AlabConfig().load()
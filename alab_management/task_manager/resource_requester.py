@@ -2,16 +2,15 @@
 TaskLauncher is the core module of the system,
 which actually executes the tasks.
 """
-import time
 from concurrent.futures import Future
+from dataclasses import asdict
 from datetime import datetime
-from threading import Thread
+from threading import Event, Thread
 from traceback import print_exc
 from typing import Any, Dict, List, Optional, Type, Union, cast
 
 import dill
 from bson import ObjectId
-from pydantic import BaseModel, root_validator
 
 from alab_management.device_view.device import BaseDevice
 from alab_management.sample_view.sample import SamplePosition
@@ -26,10 +25,17 @@ _ResourceRequestDict = Dict[
     Optional[Union[Type[BaseDevice], str]], _SampleRequestDict
 ]  # the raw request sent by task process
 
+# bounds (in seconds) of the interval between two polls of the pending requests
+_MIN_POLL_INTERVAL = 0.05
+_MAX_POLL_INTERVAL = 0.5
 
-class ResourcesRequest(BaseModel):
+
+def normalize_resource_request(resource_request: _ResourceRequestDict) -> List[Dict[str, Any]]:
     """
-    This class is used to validate the resource request. Each request should have a format of
+    Convert the raw resource request sent by the task process to the format stored in the database.
+
+    The raw request has a format of ``{device: {prefix: number, ...}, ...}``, where device can be a device name,
+    a device type or None. The normalized request has a format of
     [
         {
             "device":{
@@ -51,36 +57,36 @@ class ResourcesRequest(BaseModel):
     --------
         :py:class:`SamplePositionRequest <alab_management.sample_view.sample_view.SamplePositionRequest>`
     """
-
-    __root__: List[
-        Dict[str, Union[List[Dict[str, Union[str, int]]], Dict[str, str]]]
-    ]  # type: ignore
-
-    @root_validator(pre=True, allow_reuse=True)
-    def preprocess(cls, values):
-        """Preprocess the request."""
-        values = values["__root__"]
-
-        new_values = []
-        for request_dict in values:
-            if request_dict["device"]["identifier"] not in [
-                "name",
-                "type",
-                _EXTRA_REQUEST,
-            ]:
-                raise ValueError(
-                    f"device identifier must be one of 'name', 'type', or {_EXTRA_REQUEST}"
-                )
-            new_values.append(
-                {
-                    "device": {
-                        "identifier": request_dict["device"]["identifier"],
-                        "content": request_dict["device"]["content"],
-                    },
-                    "sample_positions": request_dict["sample_positions"],
-                }
+    formatted_resource_request = []
+    for device, position_dict in resource_request.items():
+        if device is None:
+            identifier = _EXTRA_REQUEST
+            content = _EXTRA_REQUEST
+        elif isinstance(device, str):
+            identifier = "name"
+            content = device
+        elif isinstance(device, type) and issubclass(device, BaseDevice):
+            identifier = "type"
+            content = device.__name__
+        else:
+            raise ValueError(
+                "device must be a name of a specific device, a class of type BaseDevice, or None"
             )
-        return {"__root__": new_values}
+
+        positions = [
+            asdict(SamplePositionRequest(prefix=prefix, number=number))
+            for prefix, number in position_dict.items()
+        ]  # immediate dict conversion - SamplePositionRequest is only used to check request format.
+        formatted_resource_request.append(
+            {
+                "device": {
+                    "identifier": identifier,
+                    "content": content,
+                },
+                "sample_positions": positions,
+            }
+        )
+    return formatted_resource_request
 
 
 class RequestMixin:
@@ -135,6 +141,7 @@ class ResourceRequester(RequestMixin):
 
         super().__init__()
         self._stop = False
+        self._new_request = Event()  # set when a request is submitted, to wake up the polling thread
         self._thread = Thread(
             target=self._check_request_status_loop, name="CheckRequestStatus"
         )
@@ -144,6 +151,7 @@ class ResourceRequester(RequestMixin):
     def __close__(self):
         """Close the thread."""
         self._stop = True
+        self._new_request.set()
         self._thread.join()
 
     __del__ = __close__
@@ -164,42 +172,11 @@ class ResourceRequester(RequestMixin):
         if priority is None:
             priority = self.priority
 
-        formatted_resource_request = []
-
-        device_str_to_request = {}
-        for device, position_dict in resource_request.items():
-            if device is None:
-                identifier = _EXTRA_REQUEST
-                content = _EXTRA_REQUEST
-            elif isinstance(device, str):
-                identifier = "name"
-                content = device
-            elif issubclass(device, BaseDevice):
-                identifier = "type"
-                content = device.__name__
-            else:
-                raise ValueError(
-                    "device must be a name of a specific device, a class of type BaseDevice, or None"
-                )
-            device_str_to_request[content] = device
-
-            positions = [
-                dict(SamplePositionRequest(prefix=prefix, number=number))
-                for prefix, number in position_dict.items()
-            ]  # immediate dict conversion - SamplePositionRequest is only used to check request format.
-            formatted_resource_request.append(
-                {
-                    "device": {
-                        "identifier": identifier,
-                        "content": content,
-                    },
-                    "sample_positions": positions,
-                }
-            )
-
-        if not isinstance(formatted_resource_request, ResourcesRequest):
-            formatted_resource_request = ResourcesRequest(__root__=formatted_resource_request)  # type: ignore
-        formatted_resource_request = formatted_resource_request.dict()["__root__"]
+        formatted_resource_request = normalize_resource_request(resource_request)
+        device_str_to_request = {
+            request["device"]["content"]: device
+            for request, device in zip(formatted_resource_request, resource_request)
+        }
 
         result = self._request_collection.insert_one(
             {
@@ -212,6 +189,7 @@ class ResourceRequester(RequestMixin):
         )  # DB_ACCESS_OUTSIDE_VIEW
         _id: ObjectId = cast(ObjectId, result.inserted_id)
         self._waiting[_id] = {"f": f, "device_str_to_request": device_str_to_request}
+        self._new_request.set()
 
         try:
             result = f.result(timeout=timeout)
@@ -276,6 +254,8 @@ class ResourceRequester(RequestMixin):
         )
 
     def _check_request_status_loop(self):
+        # poll quickly right after a request is submitted, then back off while it stays pending
+        interval = _MIN_POLL_INTERVAL
         while not self._stop:
             try:
                 for request_id in self._waiting.copy():
@@ -287,7 +267,11 @@ class ResourceRequester(RequestMixin):
             except Exception:
                 print_exc()  # for debugging in the test
                 raise
-            time.sleep(0.5)
+            if self._new_request.wait(timeout=interval):
+                self._new_request.clear()
+                interval = _MIN_POLL_INTERVAL
+            else:
+                interval = min(interval * 1.5, _MAX_POLL_INTERVAL)
 
     def _handle_fulfilled_request(self, request_id: ObjectId):
         entry = self.get_request(request_id)
@@ -3,6 +3,7 @@ TaskLauncher is the core module of the system,
 which actually executes the tasks.
 """
 import time
+from dataclasses import asdict
 from datetime import datetime
 from functools import partial
 from math import inf
@@ -351,7 +352,7 @@ class TaskManager(RequestMixin):
                 {
                     "$set": {
                         "parsed_sample_positions_request": [
-                            dict(spr) for spr in parsed_sample_positions_request
+                            asdict(spr) for spr in parsed_sample_positions_request
                         ]
                     }
                 },
@@ -404,11 +405,14 @@ class TaskManager(RequestMixin):
     def _occupy_sample_positions(
             self, sample_positions: Dict[str, List[Dict[str, Any]]], task_id: ObjectId
     ):
-        for sample_positions_ in sample_positions.values():
-            for sample_position_ in sample_positions_:
-                self.sample_view.lock_sample_position(
-                    task_id, cast(str, sample_position_["name"])
-                )
+        self.sample_view.lock_sample_positions(
+            task_id=task_id,
+            positions=[
+                cast(str, sample_position_["name"])
+                for sample_positions_ in sample_positions.values()
+                for sample_position_ in sample_positions_
+            ],
+        )
 
     def _release_devices(self, devices: Dict[str, Dict[str, Any]]):
         for device in devices.values():
@@ -418,10 +422,14 @@ class TaskManager(RequestMixin):
     def _release_sample_positions(
             self, sample_positions: Dict[str, List[Dict[str, Any]]]
     ):
-        for sample_positions_ in sample_positions.values():
-            for sample_position in sample_positions_:
-                if sample_position["need_release"]:
-                    self.sample_view.release_sample_position(sample_position["name"])
+        positions_to_release = [
+            sample_position["name"]
+            for sample_positions_ in sample_positions.values()
+            for sample_position in sample_positions_
+            if sample_position["need_release"]
+        ]
+        if positions_to_release:
+            self.sample_view.release_sample_positions(positions=positions_to_release)
 
     def _check_for_request_cycle(self):
         """Check if there is a cycle in the request graph. (ie tasks occupy sample positions required by one another,
@@ -116,7 +116,7 @@ class BaseTask(ABC):
         """Returns the priority of this task."""
         if self.is_simulation:
             return 0
-        return self.lab_view._resource_requester.priority
+        return self.lab_view.priority
 
     @property
     # @abstractmethod
@@ -235,7 +235,8 @@ class BaseTask(ABC):
         if value < 0:
             raise ValueError("Priority should be a positive integer")
         if not self.__simulation:
-            self.lab_view._resource_requester.priority = int(value)
+            # passed to the resource requester by ``LabView.request_resources``
+            self.lab_view.priority = int(value)
 
     def set_message(self, message: str):
         """Sets the task message to be displayed on the dashboard."""
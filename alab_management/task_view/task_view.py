@@ -16,6 +16,11 @@ from .completed_task_view import CompletedTaskView
 
 completed_task_view = CompletedTaskView()
 
+# the status updates that need to read the task entry first (to set started_at or to update the next tasks)
+_STATUS_NEEDING_TASK_ENTRY = frozenset(
+    {TaskStatus.RUNNING, TaskStatus.COMPLETED, TaskStatus.CANCELLED, TaskStatus.ERROR}
+)
+
 
 class TaskView:
     """Task view manages the status, parameters of a task."""
@@ -163,12 +168,23 @@ class TaskView:
             task_id: the id of task to be updated
             status: the new status of the task
         """
-        task = self.get_task(task_id=task_id, encode=False)
-
         update_dict = {
             "status": status.name,
             "last_updated": datetime.now(),
         }
+
+        if status not in _STATUS_NEEDING_TASK_ENTRY:
+            # the task entry is not needed, so we skip reading it and only write the new status
+            result = self._task_collection.update_one(
+                {"_id": task_id},
+                {"$set": update_dict},
+            )
+            if result.matched_count == 0:
+                self.get_task(task_id=task_id)  # will throw error if task_id does not exist
+            return
+
+        task = self.get_task(task_id=task_id, encode=False)
+
         if status == TaskStatus.RUNNING and "started_at" not in task:
             update_dict["started_at"] = datetime.now()
         elif status == TaskStatus.COMPLETED:
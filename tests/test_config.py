@@ -0,0 +1,102 @@
+import os
+import tempfile
+from pathlib import Path
+from types import MappingProxyType
+from unittest import TestCase, mock
+
+from alab_management.config import AlabConfig, _load_frozen_config, freeze_config
+
+
+class TestAlabConfig(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config_path = Path(self.tmp_dir.name) / "config.toml"
+        self.config_path.write_text(
+            '[general]\nname = "test_lab"\n\n[mongodb]\nhost = "localhost"\nport = 27017\n',
+            encoding="utf-8",
+        )
+        self.env = mock.patch.dict(os.environ, {"ALAB_CONFIG": str(self.config_path)})
+        self.env.start()
+
+    def tearDown(self) -> None:
+        self.env.stop()
+        self.tmp_dir.cleanup()
+        _load_frozen_config.cache_clear()
+
+    def test_lazy_load(self):
+        config = AlabConfig()
+        self.assertFalse(config._loaded)
+
+        self.assertEqual("test_lab", config["general"]["name"])
+        self.assertTrue(config._loaded)
+        self.assertEqual(self.config_path.absolute(), config.path)
+
+    def test_file_not_found(self):
+        with mock.patch.dict(
+            os.environ, {"ALAB_CONFIG": str(Path(self.tmp_dir.name) / "non_exist.toml")}
+        ):
+            config = AlabConfig()  # the file is only read on first access
+
+        with self.assertRaises(FileNotFoundError):
+            config.load()
+        with self.assertRaises(FileNotFoundError):
+            config["general"]
+
+    def test_memoize(self):
+        config_1 = AlabConfig()
+        config_2 = AlabConfig()
+        config_1.load()
+        config_2.load()
+        self.assertIs(config_1._config, config_2._config)
+
+        # the file is parsed again once it is modified
+        self.config_path.write_text(
+            '[general]\nname = "new_lab"\n', encoding="utf-8"
+        )
+        stat = self.config_path.stat()
+        os.utime(self.config_path, (stat.st_atime, stat.st_mtime + 10))
+
+        config_3 = AlabConfig()
+        self.assertEqual("new_lab", config_3["general"]["name"])
+        self.assertIsNot(config_1._config, config_3._config)
+        self.assertEqual("test_lab", config_1["general"]["name"])
+
+
+class TestFreezeConfig(TestCase):
+    def test_freeze_config(self):
+        frozen = freeze_config(
+            {"a": [1, {"b": [2, [3]], "c": {}}], "d": "x", "e": [], "f": None}
+        )
+        self.assertIsInstance(frozen, MappingProxyType)
+        self.assertEqual((1, {"b": (2, (3,)), "c": {}}), frozen["a"])
+        self.assertIsInstance(frozen["a"][1], MappingProxyType)
+        self.assertIsInstance(frozen["a"][1]["c"], MappingProxyType)
+        self.assertEqual("x", frozen["d"])
+        self.assertEqual((), frozen["e"])
+        self.assertIsNone(frozen["f"])
+
+        with self.assertRaises(TypeError):
+            frozen["d"] = "y"  # type: ignore
+
+    def test_freeze_scalar_and_list(self):
+        self.assertEqual(5, freeze_config(5))  # type: ignore
+        self.assertEqual((1, (2,)), freeze_config([1, [2]]))  # type: ignore
+
+    def test_freeze_dict_subclass(self):
+        class InlineTableDict(dict):
+            pass
+
+        frozen = freeze_config({"a": InlineTableDict(b=[1])})
+        self.assertIsInstance(frozen["a"], MappingProxyType)
+        self.assertEqual((1,), frozen["a"]["b"])
+
+    def test_freeze_deep_config(self):
+        config = current = {}
+        for _ in range(5000):  # deeper than the default recursion limit
+            current["a"] = {}
+            current = current["a"]
+
+        frozen = freeze_config(config)
+        for _ in range(5000):
+            frozen = frozen["a"]
+        self.assertEqual({}, frozen)
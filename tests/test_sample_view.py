@@ -2,9 +2,11 @@ import time
 from contextlib import contextmanager
 from unittest import TestCase
 
+import numpy as np
 from bson import ObjectId
 
 from alab_management.sample_view import SampleView
+from alab_management.sample_view.sample_view import SamplePositionRequest
 from alab_management.scripts.cleanup_lab import cleanup_lab
 from alab_management.scripts.setup_lab import setup_lab
 
@@ -88,6 +90,35 @@ class TestSampleView(TestCase):
         with self.assertRaises(ValueError):
             self.sample_view.get_sample(sample_id=ObjectId())
 
+    def test_get_sample_position_parent_device(self):
+        # exact match
+        self.assertEqual(
+            "furnace_1",
+            self.sample_view.get_sample_position_parent_device("furnace_1/inside"),
+        )
+        self.assertIsNone(
+            self.sample_view.get_sample_position_parent_device("furnace_table")
+        )
+
+        # prefix match
+        self.assertEqual(
+            "furnace_1",
+            self.sample_view.get_sample_position_parent_device("furnace_1/"),
+        )
+        self.assertIsNone(
+            self.sample_view.get_sample_position_parent_device("furnace_temp")
+        )
+
+        # the prefix matches positions of several devices
+        with self.assertRaises(Exception):
+            self.sample_view.get_sample_position_parent_device("furnace_")
+
+        # no match, regex metacharacters in the prefix are escaped
+        with self.assertRaises(ValueError):
+            self.sample_view.get_sample_position_parent_device("non-exist position")
+        with self.assertRaises(ValueError):
+            self.sample_view.get_sample_position_parent_device("furnace_./inside")
+
     def test_move_sample(self):
         sample_id = self.sample_view.create_sample("test", position=None)
         sample_id_2 = self.sample_view.create_sample("test", position=None)
@@ -102,13 +133,32 @@ class TestSampleView(TestCase):
         with self.assertRaises(ValueError):
             self.sample_view.move_sample(sample_id=ObjectId(), position="furnace_table")
 
-        # try to move a sample to where it is
+        # try to move a non-exist sample to an empty position
+        with self.assertRaises(ValueError):
+            self.sample_view.move_sample(sample_id=ObjectId(), position="furnace_temp/1")
+
+        # try to move a sample to a non-exist position
+        with self.assertRaises(ValueError):
+            self.sample_view.move_sample(sample_id=sample_id, position="non-exist position")
+        sample = self.sample_view.get_sample(sample_id=sample_id)
+        self.assertEqual("furnace_table", sample.position)
+
+        # try to move a sample to where it is, which should not touch the entry
+        last_updated = self.sample_view._sample_collection.find_one({"_id": sample_id})["last_updated"]
         self.sample_view.move_sample(
             sample_id=sample_id,
             position=self.sample_view.get_sample(sample_id).position,
         )
         sample = self.sample_view.get_sample(sample_id=sample_id)
         self.assertEqual("furnace_table", sample.position)
+        self.assertEqual(
+            last_updated,
+            self.sample_view._sample_collection.find_one({"_id": sample_id})["last_updated"],
+        )
+
+        # try to update the task id of a non-exist sample
+        with self.assertRaises(ValueError):
+            self.sample_view.update_sample_task_id(sample_id=ObjectId(), task_id=ObjectId())
 
         # try to move a sample to an occupied position
         with self.assertRaises(ValueError):
@@ -177,6 +227,53 @@ class TestSampleView(TestCase):
         with self.assertRaises(ValueError):
             self.sample_view.lock_sample_position(task_id_2, position="furnace_table")
 
+    def test_lock_sample_positions(self):
+        task_id = ObjectId()
+        positions = ["furnace_table", "furnace_temp/1", "furnace_temp/2"]
+
+        self.sample_view.lock_sample_positions(task_id=task_id, positions=positions)
+        self.assertListEqual(
+            sorted(positions),
+            sorted(self.sample_view.get_sample_positions_by_task(task_id)),
+        )
+
+        # lock the same positions twice with same task id
+        self.sample_view.lock_sample_positions(task_id=task_id, positions=positions)
+
+        # try to lock the positions with different task id
+        task_id_2 = ObjectId()
+        with self.assertRaises(ValueError):
+            self.sample_view.lock_sample_positions(
+                task_id=task_id_2, positions=["furnace_temp/3", "furnace_table"]
+            )
+        # a failed call does not leave any lock behind
+        self.assertListEqual([], self.sample_view.get_sample_positions_by_task(task_id_2))
+
+        self.sample_view.release_sample_positions(positions)
+        self.assertListEqual([], self.sample_view.get_sample_positions_by_task(task_id))
+
+        # try to lock a sample position that already has a sample
+        self.sample_view.create_sample("test", position="furnace_table")
+        with self.assertRaises(ValueError):
+            self.sample_view.lock_sample_positions(task_id=task_id, positions=positions)
+
+        # try to lock or release non-exist positions
+        with self.assertRaises(ValueError):
+            self.sample_view.lock_sample_positions(
+                task_id=task_id, positions=["furnace_temp/1", "non-exist position"]
+            )
+        self.assertListEqual([], self.sample_view.get_sample_positions_by_task(task_id))
+
+        self.sample_view.lock_sample_positions(task_id=task_id, positions=["furnace_temp/1"])
+        with self.assertRaises(ValueError):
+            self.sample_view.release_sample_positions(
+                ["furnace_temp/1", "non-exist position"]
+            )
+        # nothing is released if any of the positions is invalid
+        self.assertListEqual(
+            ["furnace_temp/1"], self.sample_view.get_sample_positions_by_task(task_id)
+        )
+
     def test_request_sample_position_single(self):
         task_id = ObjectId()
 
@@ -400,3 +497,81 @@ class TestSampleView(TestCase):
                 [{"prefix": "furnace_temp", "number": 4}], task_id_2
             ) as sample_positions_:
                 self.assertIs(None, sample_positions_)
+
+    def test_request_sample_positions_non_exist_prefix(self):
+        task_id = ObjectId()
+
+        # a prefix matching nothing is an error, even if no position is requested
+        with self.assertRaises(ValueError):
+            self.sample_view.request_sample_positions(
+                task_id=task_id,
+                sample_positions=[{"prefix": "non-exist position", "number": 0}],
+            )
+
+    def test_bulk_request_sample_positions(self):
+        task_id = ObjectId()
+        sample_id = self.sample_view.create_sample("test", position="furnace_temp/1")
+        self.sample_view.update_sample_task_id(sample_id=sample_id, task_id=task_id)
+
+        # overlapping prefixes, furnace_temp/1 is matched by both of them
+        matched_positions = self.sample_view.bulk_request_sample_positions(
+            prefixes=["furnace_temp", "furnace_temp/1"]
+        )
+        self.assertListEqual(
+            ["furnace_temp/1", "furnace_temp/2", "furnace_temp/3", "furnace_temp/4"],
+            sorted(sp["name"] for sp in matched_positions["furnace_temp"]),
+        )
+        self.assertListEqual(
+            ["furnace_temp/1"],
+            [sp["name"] for sp in matched_positions["furnace_temp/1"]],
+        )
+        self.assertListEqual(
+            [{"task_id": task_id}], matched_positions["furnace_temp/1"][0]["_occupants"]
+        )
+
+        sample_positions = self.sample_view.request_sample_positions(
+            task_id=task_id,
+            sample_positions=[
+                {"prefix": "furnace_temp", "number": 4},
+                {"prefix": "furnace_temp/1", "number": 1},
+            ],
+        )
+        self.assertEqual(4, len(sample_positions["furnace_temp"]))
+        self.assertListEqual(
+            [{"name": "furnace_temp/1", "need_release": True}],
+            sample_positions["furnace_temp/1"],
+        )
+
+        # the position occupied by the sample of task_id is not available to other tasks
+        self.assertIsNone(
+            self.sample_view.request_sample_positions(
+                task_id=ObjectId(),
+                sample_positions=[{"prefix": "furnace_temp/1", "number": 1}],
+            )
+        )
+
+
+class TestSamplePositionRequest(TestCase):
+    def test_create(self):
+        request = SamplePositionRequest.from_py_type("furnace_temp")
+        self.assertEqual(("furnace_temp", 1), (request.prefix, request.number))
+
+        request = SamplePositionRequest.from_py_type({"prefix": "furnace_temp", "number": 0})
+        self.assertEqual(0, request.number)
+
+        # other integral types are converted to int
+        request = SamplePositionRequest(prefix="furnace_temp", number=np.int64(4))
+        self.assertIs(int, type(request.number))
+        self.assertEqual(4, request.number)
+
+    def test_invalid_request(self):
+        for number in [-1, 1.5, "4", True, None]:
+            with self.assertRaises(ValueError):
+                SamplePositionRequest(prefix="furnace_temp", number=number)
+
+        with self.assertRaises(ValueError):
+            SamplePositionRequest(prefix=1)
+
+        # unknown fields are rejected
+        with self.assertRaises(TypeError):
+            SamplePositionRequest.from_py_type({"prefix": "furnace_temp", "count": 2})
@@ -6,12 +6,16 @@ from traceback import print_exc
 from bson import ObjectId
 
 from alab_management.device_view import DeviceTaskStatus, DeviceView
-from alab_management.device_view.device import get_all_devices
+from alab_management.device_view.device import BaseDevice, get_all_devices
 from alab_management.sample_view import SampleView
 from alab_management.sample_view.sample_view import SamplePositionStatus
 from alab_management.scripts.cleanup_lab import cleanup_lab
 from alab_management.scripts.setup_lab import setup_lab
-from alab_management.task_manager.resource_requester import ResourceRequester
+from alab_management.task_manager.enums import _EXTRA_REQUEST
+from alab_management.task_manager.resource_requester import (
+    ResourceRequester,
+    normalize_resource_request,
+)
 from alab_management.task_manager.task_manager import TaskManager
 
 
@@ -179,3 +183,35 @@ class TestTaskManager(unittest.TestCase):
             self.resource_requester.request_resources(
                 {None: {"furnace_temp": 10}}, timeout=4
             )
+
+
+class TestNormalizeResourceRequest(unittest.TestCase):
+    def test_normalize_resource_request(self):
+        class Furnace(BaseDevice):
+            pass
+
+        self.assertListEqual(
+            [
+                {
+                    "device": {"identifier": "type", "content": "Furnace"},
+                    "sample_positions": [{"prefix": "inside", "number": 1}],
+                },
+                {
+                    "device": {"identifier": "name", "content": "dummy"},
+                    "sample_positions": [],
+                },
+                {
+                    "device": {"identifier": _EXTRA_REQUEST, "content": _EXTRA_REQUEST},
+                    "sample_positions": [{"prefix": "furnace_temp", "number": 4}],
+                },
+            ],
+            normalize_resource_request(
+                {Furnace: {"inside": 1}, "dummy": {}, None: {"furnace_temp": 4}}
+            ),
+        )
+
+    def test_invalid_resource_request(self):
+        with self.assertRaises(ValueError):
+            normalize_resource_request({1: {}})
+        with self.assertRaises(ValueError):
+            normalize_resource_request({None: {"furnace_temp": -1}})
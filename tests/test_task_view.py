@@ -91,6 +91,32 @@ class TestTaskView(TestCase):
         with self.assertRaises(ValueError):
             self.task_view.get_status(non_existent_task_id)
 
+    def test_update_status_without_reading_task(self):
+        task_dict = {
+            "task_type": "Heating",
+            "samples": [{"name": "sample1", "sample_id": ObjectId()}],
+            "parameters": {"setpoints": [[10, 600]]},
+        }
+        task_id = self.task_view.create_task(**task_dict)
+
+        # statuses that do not need the task entry are written directly
+        self.task_view.update_status(task_id=task_id, status=TaskStatus.REQUESTING_RESOURCES)
+        task = self.task_view.get_task(task_id)
+        self.assertEqual(TaskStatus.REQUESTING_RESOURCES.name, task["status"])
+        self.assertNotIn("started_at", task)
+
+        # started_at is only set the first time the task is RUNNING
+        self.task_view.update_status(task_id=task_id, status=TaskStatus.RUNNING)
+        started_at = self.task_view.get_task(task_id)["started_at"]
+        self.task_view.update_status(task_id=task_id, status=TaskStatus.REQUESTING_RESOURCES)
+        self.task_view.update_status(task_id=task_id, status=TaskStatus.RUNNING)
+        task = self.task_view.get_task(task_id)
+        self.assertEqual(TaskStatus.RUNNING.name, task["status"])
+        self.assertEqual(started_at, task["started_at"])
+
+        with self.assertRaises(ValueError):
+            self.task_view.update_status(ObjectId(), TaskStatus.REQUESTING_RESOURCES)
+
     def test_get_ready_tasks(self):
         task_dict = {
             "task_type": "Heating",